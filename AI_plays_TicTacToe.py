@@ -15,25 +15,20 @@ Let's start by defining the core constants and helper functions.
 """
 
 from itertools import combinations
-from time import sleep
+import os
+import random
+import sys
+from time import perf_counter, sleep
 
 magic = [8, 3, 4, 1, 5, 9, 6, 7, 2]
-magic_ = {
-    8 : 0,
-    3 : 1,
-    4 : 2,
-    1 : 3,
-    5 : 4,
-    9 : 5,
-    6 : 6,
-    7 : 7,
-    2 : 8
-}
-
-score_dict = {
-    "X" : 1,
-    "O" : -1
-}
+
+# The 8 winning lines (triples of cells whose magic numbers add up to 15),
+# as 9-bit masks where bit i stands for board[i]
+LINES = [
+    sum(1 << i for i in triple)
+    for triple in combinations(range(9), 3)
+    if sum(magic[i] for i in triple) == 15
+]
 
 def print_board(board):
     print("|".join(board[0:3]))
@@ -42,41 +37,187 @@ def print_board(board):
 
     return None
 
-def check_player_win(board, player):
-    player_moves_ = [i for i in range(9) if board[i] == player]
-    avail_magic = [magic[i] for i in avail_moves(board)]
+def winning_cells(bits):
+    cells = 0
+    for line in LINES:
+        own = bits & line
+        if own.bit_count() == 2:
+            cells |= line ^ own
+
+    return cells
+
+def is_won(bits):
+    return any(bits & line == line for line in LINES)
 
-    for tuple_ in combinations(player_moves_, 2):
-        surp = 15 - (magic[tuple_[0]] + magic[tuple_[1]])
-        if surp in avail_magic:
-            return magic_[surp], score_dict[player]
+# winning_cells and is_won for all 512 sets of cells a player can hold
+WIN_CELLS = [winning_cells(bits) for bits in range(512)]
+WON = [is_won(bits) for bits in range(512)]
+
+def check_player_win(bits, opp_bits, score):
+    cells = WIN_CELLS[bits] & ~opp_bits
+    if cells:
+        return (cells & -cells).bit_length() - 1, score
 
     return None
 
-def avail_moves(board):
-    return [i for i in range(9) if board[i] == "_"]
+def avail_iter(occ):
+    empty = ~occ & 0x1FF
+    while empty:
+        yield (empty & -empty).bit_length() - 1
+        empty &= empty - 1
+
+# The 8 symmetries of the board (rotations and reflections), each as a list p
+# sending cell j to cell p[j]. Symmetric positions have the same score.
+ROTATE = [2, 5, 8, 1, 4, 7, 0, 3, 6]
+MIRROR = [2, 1, 0, 5, 4, 3, 8, 7, 6]
+SYMMETRIES = []
+p = list(range(9))
+for _ in range(4):
+    p = [ROTATE[j] for j in p]
+    SYMMETRIES += [p, [MIRROR[j] for j in p]]
+INVERSES = [[p.index(j) for j in range(9)] for p in SYMMETRIES]
+
+# PERMUTED[k][bits]: the bitboard `bits` moved by the k-th symmetry
+PERMUTED = [[sum((bits >> j & 1) << p[j] for j in range(9)) for bits in range(512)] for p in SYMMETRIES]
+
+def canonical(x_bits, o_bits):
+    # Compare the images packed into one int, without building a tuple per symmetry
+    best, sym = 1 << 18, 0
+    for k in range(8):
+        table = PERMUTED[k]
+        image = table[x_bits] << 9 | table[o_bits]
+        if image < best:
+            best, sym = image, k
+
+    return best >> 9, best & 0x1FF, sym
+
+# Transposition table: (x_bits, o_bits, is_x_turn, alpha, beta) -> (move, score),
+# with the position and move in canonical form. The same position is reached
+# through many move orders and symmetries. alpha and beta are part of the key,
+# since a cut-off score is only a bound.
+tt = {}
 
-def minimax(board, player, opp):
-    avail_moves_ = avail_moves(board)
-    if not avail_moves_:
+# Best move found for (x_bits, o_bits, is_x_turn) under any window, in canonical
+# form. It is searched first the next time the position comes up.
+best_moves = {}
+
+def stored_move(key, sym):
+    move = best_moves.get(key[:3])
+    return None if move is None else INVERSES[sym][move]
+
+# Moves are tried center first, then corners, then edges, which makes
+# alpha-beta cut-offs come earlier. NEXT_MOVE[empty] is the first cell of
+# MOVE_ORDER in the `empty` mask.
+MOVE_ORDER = [4, 0, 2, 6, 8, 1, 3, 5, 7]
+NEXT_MOVE = [next((i for i in MOVE_ORDER if empty >> i & 1), None) for empty in range(512)]
+
+def terminal(x_bits, o_bits, is_x_turn):
+    if x_bits | o_bits == 0x1FF:
         return None, 0
+    if is_x_turn:
+        return check_player_win(x_bits, o_bits, 1)
+    return check_player_win(o_bits, x_bits, -1)
 
-    res = check_player_win(board, player)
+def minimax(x_bits, o_bits, is_x_turn, alpha=-1, beta=1):
+    cx, co, sym = canonical(x_bits, o_bits)
+    key = (cx, co, is_x_turn, alpha, beta)
+    if key in tt:
+        move, score_ = tt[key]
+        return INVERSES[sym][move], score_
+
+    res = terminal(x_bits, o_bits, is_x_turn)
     if res is not None:
         return res
 
-    scores = []
-    for i in avail_moves_:
-        new_board = board.copy()
-        new_board[i] = player
-        _, score_ = minimax(new_board, opp, player)
-        scores.append((i, score_))
+    # Depth first search with an explicit stack of parent frames instead of recursion
+    stack = []
+    empty = ~(x_bits | o_bits) & 0x1FF
+    first = stored_move(key, sym)
+    best_move, best = None, -2 if is_x_turn else 2
+    while True:
+        if empty and alpha < beta:
+            if first is not None:
+                i, first = first, None
+            else:
+                i = NEXT_MOVE[empty]
+            empty &= ~(1 << i)
+            if is_x_turn:
+                child = x_bits | 1 << i, o_bits
+            else:
+                child = x_bits, o_bits | 1 << i
+            cx, co, child_sym = canonical(*child)
+            child_key = (cx, co, not is_x_turn, alpha, beta)
+            res = tt.get(child_key) or terminal(*child, not is_x_turn)
+            if res is None:
+                # Descend: save this frame and start searching the child
+                stack.append((key, sym, x_bits, o_bits, is_x_turn, empty, alpha, beta, best_move, best, i))
+                key, sym = child_key, child_sym
+                x_bits, o_bits = child
+                is_x_turn = not is_x_turn
+                empty = ~(x_bits | o_bits) & 0x1FF
+                first = stored_move(key, sym)
+                best_move, best = None, -2 if is_x_turn else 2
+                continue
+            score_ = res[1]
+        else:
+            # All moves searched (or pruned): store the result and return to the parent
+            tt[key] = SYMMETRIES[sym][best_move], best
+            best_moves[key[:3]] = SYMMETRIES[sym][best_move]
+            if not stack:
+                return best_move, best
+            score_ = best
+            key, sym, x_bits, o_bits, is_x_turn, empty, alpha, beta, best_move, best, i = stack.pop()
+
+        if is_x_turn:
+            if score_ > best:
+                best_move, best = i, score_
+                if best > alpha:
+                    alpha = best
+        elif score_ < best:
+            best_move, best = i, score_
+            if best < beta:
+                beta = best
 
-    scores.sort(key=lambda x: x[1])
-    return scores[-1] if player == "X" else scores[0]
+# Opening book: (x_bits, o_bits) -> (move, score) for the AI's first move, so the
+# most expensive searches (on the empty or nearly empty board) never run.
+# AI opens in a corner; after your first move it takes the center, or a corner if you took it.
+OPENING_BOOK = {(0, 0): (0, 0)}
+OPENING_BOOK.update({(0, 1 << i): (0 if i == 4 else 4, 0) for i in range(9)})
 
-def main():
+def solve_game():
+    best = dict(OPENING_BOOK)
+    seen = set()
+
+    def visit(x_bits, o_bits, is_x_turn):
+        if (x_bits, o_bits, is_x_turn) in seen:
+            return
+        seen.add((x_bits, o_bits, is_x_turn))
+        if x_bits | o_bits == 0x1FF or WON[x_bits] or WON[o_bits]:
+            return
+
+        if is_x_turn and (x_bits, o_bits) not in best:
+            best[x_bits, o_bits] = minimax(x_bits, o_bits, True)
+        for i in avail_iter(x_bits | o_bits):
+            if is_x_turn:
+                visit(x_bits | 1 << i, o_bits, False)
+            else:
+                visit(x_bits, o_bits | 1 << i, True)
+
+    visit(0, 0, True)
+    visit(0, 0, False)
+    return best
+
+# (x_bits, o_bits) -> (move, score) for every position where the AI is to move,
+# so the AI's move during a game is a single lookup
+BEST = solve_game()
+
+# Pause (in seconds) before the AI moves, so its moves don't appear instantly.
+# Set the environment variable TTT_NO_DELAY to play (or benchmark) without it.
+UI_DELAY = 0 if os.environ.get("TTT_NO_DELAY") else 0.3
+
+def main(delay=UI_DELAY):
     board = ["_" for _ in range(9)]
+    x_bits, o_bits = 0, 0
 
     # ===============[[ Output title like this ]]===============
     print(f"")
@@ -88,17 +229,14 @@ def main():
     print(f"")
 
     print("AI will play 'X', you play 'O'.")
-    if input("Do you want to play first? [Y/n] ") == 'n':
-        player, opp = "X", "O"
-    else:
-        player, opp = "O", "X"
+    # AI plays "X", so it is AI's turn whenever is_x_turn is True
+    is_x_turn = input("Do you want to play first? [Y/n] ") == 'n'
 
     while True:
-        if player == "X":
+        if is_x_turn:
             print("\nThis is AI's turn.\n")
-            sleep(0.3)
-            res_x = check_player_win(board, "X")
-            res_o = check_player_win(board, "O")
+            sleep(delay)
+            res_x = check_player_win(x_bits, o_bits, 1)
             if res_x is not None:
                 move_index = res_x[0]
                 print(f"Above board score: {res_x[1]}\n")
@@ -106,14 +244,18 @@ def main():
                 print_board(board)
                 print("\nAI wins!")
                 break
-            elif res_o is not None:
+
+            # Only needed if AI can't win right away
+            res_o = check_player_win(o_bits, x_bits, -1)
+            if res_o is not None:
                 move_index = res_o[0]
                 print(f"Above board score: {res_o[1]}\n")
             else:
-                move_index, score_ = minimax(board, "X", "O")
+                move_index, score_ = BEST[x_bits, o_bits]
                 print(f"Above board score: {- score_}\n")
 
             board[move_index] = "X"
+            x_bits |= 1 << move_index
         else:
             print("\nThis is your turn.\n")
             while True:
@@ -137,22 +279,56 @@ def main():
                           \n")
 
             board[move_index] = "O"
+            o_bits |= 1 << move_index
             print(f"")
 
         print_board(board)
-        player, opp = opp, player
+        is_x_turn = not is_x_turn
 
-        if not avail_moves(board):
+        occ = x_bits | o_bits
+        if occ == 0x1FF:
             print(f"It's a draw!")
             break
-
-        if len(avail_moves(board)) == 1:
-            if player == "O":
+        elif (occ ^ 0x1FF).bit_count() == 1:
+            if not is_x_turn:
                 print(f"\nIt will be a draw after your move!\n")
-                board[avail_moves(board)[0]] = "O"
+                board[next(avail_iter(occ))] = "O"
                 print_board(board)
                 break
 
+def self_play(n=1000, rng=random):
+    """Play n games of the AI against random legal moves, e.g. for benchmarking.
+    BEST is shared by all games, so they need no search at all."""
+    results = {"X_wins": 0, "O_wins": 0, "draws": 0}
+    start = perf_counter()
+    for game in range(n):
+        x_bits, o_bits = 0, 0
+        is_x_turn = game % 2 == 0
+        while True:
+            if is_x_turn:
+                res = check_player_win(x_bits, o_bits, 1) or check_player_win(o_bits, x_bits, -1) or BEST[x_bits, o_bits]
+                x_bits |= 1 << res[0]
+            else:
+                o_bits |= 1 << rng.choice(list(avail_iter(x_bits | o_bits)))
+
+            if WON[x_bits]:
+                results["X_wins"] += 1
+                break
+            if WON[o_bits]:
+                results["O_wins"] += 1
+                break
+            if x_bits | o_bits == 0x1FF:
+                results["draws"] += 1
+                break
+            is_x_turn = not is_x_turn
+
+    elapsed = perf_counter() - start
+    print(f"{n} games in {elapsed:.3f}s ({n / elapsed:.0f} games/sec): {results}")
+    return results
+
 
 if __name__ == "__main__":
-    main()
+    if sys.argv[1:2] == ["--self-play"]:
+        self_play(int(sys.argv[2]) if len(sys.argv) > 2 else 1000)
+    else:
+        main()
@@ -16,6 +16,7 @@ Click to make your moves as ⭕, while the AI responds as <span style="color: #d
 """
 
 from itertools import combinations
+import os
 from IPython.display import display, clear_output
 import ipywidgets as widgets
 from time import sleep
@@ -57,17 +58,14 @@ Let's start by defining the core constants.
 """# }}}
 
 magic = [8, 3, 4, 1, 5, 9, 6, 7, 2]
-magic_ = {
-    8 : 0,
-    3 : 1,
-    4 : 2,
-    1 : 3,
-    5 : 4,
-    9 : 5,
-    6 : 6,
-    7 : 7,
-    2 : 8
-}
+
+# The 8 winning lines (triples of cells whose magic numbers add up to 15),
+# as 9-bit masks where bit i stands for board[i]
+LINES = [
+    sum(1 << i for i in triple)
+    for triple in combinations(range(9), 3)
+    if sum(magic[i] for i in triple) == 15
+]
 
 # }}}
 
@@ -80,6 +78,7 @@ print(f"==={17*'='}[[ Board Display Functions ]]{17*'='}==\n")
 """# {{{
 
 These functions create and update the interactive game board using ipywidgets.
+Every attribute change on a button is sent to the browser, so after a move only the changed button is updated (`update_one`).
 The board uses border styling to create the classic # grid pattern.
 
 """# }}}
@@ -122,18 +121,24 @@ def make_board_display(board, click_handler):
     )
     return grid, buttons
 
-def update_(buttons, board):
+def update_one(buttons, board, i):
+    """Update the color and text of button i to reflect board[i]."""
+    button = buttons[i]
+    style = button.style
+    if board[i] == "X":
+        button.description = "❌"
+        style.button_color = "#ffe6e6"
+    elif board[i] == "O":
+        button.description = "⭕"
+        style.button_color = "#e6f0ff"
+    else:
+        button.description = " "
+        style.button_color = "#ffffff"
+
+def update_all(buttons, board):
     """Update button colors and text to reflect current board state."""
-    for i, cell in enumerate(board):
-        if cell == "X":
-            buttons[i].description = "❌"
-            buttons[i].style.button_color = "#ffe6e6"
-        elif cell == "O":
-            buttons[i].description = "⭕"
-            buttons[i].style.button_color = "#e6f0ff"
-        else:
-            buttons[i].description = " "
-            buttons[i].style.button_color = "#ffffff"
+    for i in range(9):
+        update_one(buttons, board, i)
 
 def disable_all(buttons):
     """Disable all buttons on the board."""
@@ -152,20 +157,17 @@ print(f"==={18*'='}[[ Game Logic Functions ]]{18*'='}===\n")
 
 Core game mechanics including win detection and the **minimax AI algorithm**.
 
-A helper dictionary and a function first.
+A helper function first.
 
 """# }}}
 
-# AI will always play "X" and human "O"
-score_dict = {
-    "X" : 1,
-    "O" : -1
-}
+def avail_iter(occ):
+    """ This function yields all empty positions on the board, given the occupied ones as a bitmask `occ` (x_bits | o_bits).  """
 
-def avail_moves(board):
-    """ This function simply returns all empty positions (marked with '_') on the board.  """
-
-    return [i for i in range(9) if board[i] == "_"]
+    empty = ~occ & 0x1FF
+    while empty:
+        yield (empty & -empty).bit_length() - 1
+        empty &= empty - 1
 
 # ===============[[ Output title like this ]]===============
 print(f"")
@@ -176,13 +178,18 @@ print(f"==={17*'='}[[ Check for Winning Moves ]]{17*'='}==\n")
 """# docstring{{{
 
 This function uses the magic square logic.
-For each pair of the player's existing moves, check if the magic square
-values of those positions and of an available position add up to 15 (winning line).
+The winning lines are the triples of cells whose magic square values add up to 15;
+they are precomputed as bitmasks in `LINES`.
+`winning_cells(bits)` collects, for every line with two of its cells held by
+the player (`bits`), the third cell of that line.
+Since a player can only hold 512 different sets of cells, this is computed once for all of them (`WIN_CELLS`),
+and checking a position is a single table lookup: a winning move is a cell in `WIN_CELLS[bits]` the opponent doesn't hold.
+In the same way `WON[bits]` tells whether `bits` already contains a complete line.
 
 If a winning move exists, it returns:
 
 - the **index** of the winning square, and
-- the **score** of the board position.
+- the **score** of the board position, which is just the `score` passed in: +1 for the AI ("X"), -1 for the human ("O").
 
 Returns None if there's no winning moves.
 
@@ -191,14 +198,26 @@ Returns None if there's no winning moves.
 
 """# }}}
 
-def check_player_win(board, player):
-    player_moves_ = [i for i in range(9) if board[i] == player]
-    avail_magic = [magic[i] for i in avail_moves(board)]
+def winning_cells(bits):
+    cells = 0
+    for line in LINES:
+        own = bits & line
+        if own.bit_count() == 2:
+            cells |= line ^ own
+
+    return cells
 
-    for tuple_ in combinations(player_moves_, 2):
-        surp = 15 - (magic[tuple_[0]] + magic[tuple_[1]])
-        if surp in avail_magic:
-            return magic_[surp], score_dict[player]
+def is_won(bits):
+    return any(bits & line == line for line in LINES)
+
+# winning_cells and is_won for all 512 sets of cells a player can hold
+WIN_CELLS = [winning_cells(bits) for bits in range(512)]
+WON = [is_won(bits) for bits in range(512)]
+
+def check_player_win(bits, opp_bits, score):
+    cells = WIN_CELLS[bits] & ~opp_bits
+    if cells:
+        return (cells & -cells).bit_length() - 1, score
 
     return None
 
@@ -213,34 +232,203 @@ print(f"==={18*'='}[[ The Minimax Algorithm ]]{18*'='}==\n")
 Minimax algorithm for optimal AI move selection.
 
 Algorithm:
-        Recursively explores all possible game states assuming optimal play.
+        Explores all possible game states (depth first) assuming optimal play.
 
         - X (AI) maximizes the score (+1 for win)
         - O (human) minimizes the score (-1 for win)
         - Returns (move, score): score of a board position and a move that achieves that score
         - Returns (None, 0) for draw
 
+**Alpha-beta pruning:** `alpha` is the best score X is already guaranteed and `beta` the best score O is already guaranteed.
+As soon as `alpha >= beta` the remaining moves at that node can't change the result, so they are skipped.
+The search starts from `alpha = -1`, `beta = 1`, the worst and best possible scores,
+so once a move wins (+1 for X, -1 for O) the other moves at that node are skipped too.
+
+**Bitboards:** the board is passed as two 9-bit masks, `x_bits` and `o_bits`.
+A move is a single `x_bits | 1 << i` (no board copy), and the empty squares are
+`~(x_bits | o_bits) & 0x1FF`, visited one lowest set bit at a time.
+
+**Transposition table:** the same position is reached through many different move orders.
+Every searched position is stored in the dictionary `tt`, so it is only searched once.
+A rotated or mirrored board has the same score, so positions are stored in a canonical form:
+`canonical` tries the 8 symmetries of the board (precomputed for every bitboard in `PERMUTED`) and keeps the smallest image.
+The stored move is mapped back through the inverse symmetry when it is read.
+
+**Move ordering:** alpha-beta prunes the most when the best move is searched first.
+Moves are tried in the classic order center, corners, edges (`MOVE_ORDER`),
+except that a move already found best for the same position (`best_moves`) is tried before all others.
+`terminal` returns the score of positions that need no search: a full board or an immediate win.
+
+**Explicit stack:** the search is a loop instead of a recursion.
+Going one move deeper pushes the current frame (position, remaining moves, alpha, beta, best so far) onto `stack`;
+once a position is finished its score is handed to the frame popped off the stack.
+This avoids the cost of a Python function call per position.
+
+**Opening book:** the AI's first move is looked up in `OPENING_BOOK` instead of searched,
+since searching the empty board is by far the most expensive call.
+
 """# }}}
 
 
-def minimax(board, player, opp):
-    avail_moves_ = avail_moves(board)
-    if not avail_moves_:
+# The 8 symmetries of the board (rotations and reflections), each as a list p
+# sending cell j to cell p[j]. Symmetric positions have the same score.
+ROTATE = [2, 5, 8, 1, 4, 7, 0, 3, 6]
+MIRROR = [2, 1, 0, 5, 4, 3, 8, 7, 6]
+SYMMETRIES = []
+p = list(range(9))
+for _ in range(4):
+    p = [ROTATE[j] for j in p]
+    SYMMETRIES += [p, [MIRROR[j] for j in p]]
+INVERSES = [[p.index(j) for j in range(9)] for p in SYMMETRIES]
+
+# PERMUTED[k][bits]: the bitboard `bits` moved by the k-th symmetry
+PERMUTED = [[sum((bits >> j & 1) << p[j] for j in range(9)) for bits in range(512)] for p in SYMMETRIES]
+
+def canonical(x_bits, o_bits):
+    # Compare the images packed into one int, without building a tuple per symmetry
+    best, sym = 1 << 18, 0
+    for k in range(8):
+        table = PERMUTED[k]
+        image = table[x_bits] << 9 | table[o_bits]
+        if image < best:
+            best, sym = image, k
+
+    return best >> 9, best & 0x1FF, sym
+
+# Transposition table: (x_bits, o_bits, is_x_turn, alpha, beta) -> (move, score),
+# with the position and move in canonical form. The same position is reached
+# through many move orders and symmetries. alpha and beta are part of the key,
+# since a cut-off score is only a bound.
+tt = {}
+
+# Best move found for (x_bits, o_bits, is_x_turn) under any window, in canonical
+# form. It is searched first the next time the position comes up.
+best_moves = {}
+
+def stored_move(key, sym):
+    move = best_moves.get(key[:3])
+    return None if move is None else INVERSES[sym][move]
+
+# Moves are tried center first, then corners, then edges, which makes
+# alpha-beta cut-offs come earlier. NEXT_MOVE[empty] is the first cell of
+# MOVE_ORDER in the `empty` mask.
+MOVE_ORDER = [4, 0, 2, 6, 8, 1, 3, 5, 7]
+NEXT_MOVE = [next((i for i in MOVE_ORDER if empty >> i & 1), None) for empty in range(512)]
+
+def terminal(x_bits, o_bits, is_x_turn):
+    if x_bits | o_bits == 0x1FF:
         return None, 0
-
-    res = check_player_win(board, player)
+    if is_x_turn:
+        return check_player_win(x_bits, o_bits, 1)
+    return check_player_win(o_bits, x_bits, -1)
+
+def minimax(x_bits, o_bits, is_x_turn, alpha=-1, beta=1):
+    cx, co, sym = canonical(x_bits, o_bits)
+    key = (cx, co, is_x_turn, alpha, beta)
+    if key in tt:
+        move, score_ = tt[key]
+        return INVERSES[sym][move], score_
+
+    res = terminal(x_bits, o_bits, is_x_turn)
     if res is not None:
         return res
 
-    scores = []
-    for i in avail_moves_:
-        new_board = board.copy()
-        new_board[i] = player
-        _, score_ = minimax(new_board, opp, player)
-        scores.append((i, score_))
+    # Depth first search with an explicit stack of parent frames instead of recursion
+    stack = []
+    empty = ~(x_bits | o_bits) & 0x1FF
+    first = stored_move(key, sym)
+    best_move, best = None, -2 if is_x_turn else 2
+    while True:
+        if empty and alpha < beta:
+            if first is not None:
+                i, first = first, None
+            else:
+                i = NEXT_MOVE[empty]
+            empty &= ~(1 << i)
+            if is_x_turn:
+                child = x_bits | 1 << i, o_bits
+            else:
+                child = x_bits, o_bits | 1 << i
+            cx, co, child_sym = canonical(*child)
+            child_key = (cx, co, not is_x_turn, alpha, beta)
+            res = tt.get(child_key) or terminal(*child, not is_x_turn)
+            if res is None:
+                # Descend: save this frame and start searching the child
+                stack.append((key, sym, x_bits, o_bits, is_x_turn, empty, alpha, beta, best_move, best, i))
+                key, sym = child_key, child_sym
+                x_bits, o_bits = child
+                is_x_turn = not is_x_turn
+                empty = ~(x_bits | o_bits) & 0x1FF
+                first = stored_move(key, sym)
+                best_move, best = None, -2 if is_x_turn else 2
+                continue
+            score_ = res[1]
+        else:
+            # All moves searched (or pruned): store the result and return to the parent
+            tt[key] = SYMMETRIES[sym][best_move], best
+            best_moves[key[:3]] = SYMMETRIES[sym][best_move]
+            if not stack:
+                return best_move, best
+            score_ = best
+            key, sym, x_bits, o_bits, is_x_turn, empty, alpha, beta, best_move, best, i = stack.pop()
+
+        if is_x_turn:
+            if score_ > best:
+                best_move, best = i, score_
+                if best > alpha:
+                    alpha = best
+        elif score_ < best:
+            best_move, best = i, score_
+            if best < beta:
+                beta = best
+
+# Opening book: (x_bits, o_bits) -> (move, score) for the AI's first move, so the
+# most expensive searches (on the empty or nearly empty board) never run.
+# AI opens in a corner; after your first move it takes the center, or a corner if you took it.
+OPENING_BOOK = {(0, 0): (0, 0)}
+OPENING_BOOK.update({(0, 1 << i): (0 if i == 4 else 4, 0) for i in range(9)})
 
-    scores.sort(key=lambda x: x[1])
-    return scores[-1] if player == "X" else scores[0]
+# ===============[[ Output title like this ]]===============
+print(f"")
+print(68*"=")
+print(f"==={19*'='}[[ Solving the Whole Game ]]{19*'='}==\n")
+# ==========================================================
+
+"""# {{{
+
+TicTacToe has only a few thousand positions, so instead of searching during the game
+the AI solves all of them once, when this cell runs.
+
+`solve_game` visits every position reachable from the empty board (with either player starting)
+and stores `minimax`'s answer for each one where the AI is to move, starting from the opening book.
+The AI's move during the game is then a single lookup in `BEST`.
+
+"""# }}}
+
+def solve_game():
+    best = dict(OPENING_BOOK)
+    seen = set()
+
+    def visit(x_bits, o_bits, is_x_turn):
+        if (x_bits, o_bits, is_x_turn) in seen:
+            return
+        seen.add((x_bits, o_bits, is_x_turn))
+        if x_bits | o_bits == 0x1FF or WON[x_bits] or WON[o_bits]:
+            return
+
+        if is_x_turn and (x_bits, o_bits) not in best:
+            best[x_bits, o_bits] = minimax(x_bits, o_bits, True)
+        for i in avail_iter(x_bits | o_bits):
+            if is_x_turn:
+                visit(x_bits | 1 << i, o_bits, False)
+            else:
+                visit(x_bits, o_bits | 1 << i, True)
+
+    visit(0, 0, True)
+    visit(0, 0, False)
+    return best
+
+BEST = solve_game()
 
 # }}}
 
@@ -257,12 +445,19 @@ Now play the game! Open this notebook in your Jupyter Notebook (or [![Binder](ht
 Click cells to make your move as ⭕ while the AI plays as <span style="color: #dc3545; font-size: 22px; font-weight: bold;">❌</span>.
 The AI uses the minimax algorithm, so it plays optimally - try to get a draw! 🎮
 
+The AI pauses briefly before each move; use `play_interactive(delay=0)` (or set the environment variable `TTT_NO_DELAY`) to turn that off.
+
 """# }}}
 
+# Pause (in seconds) before the AI moves, so its moves don't appear instantly.
+# Set the environment variable TTT_NO_DELAY to play (or benchmark) without it.
+UI_DELAY = 0 if os.environ.get("TTT_NO_DELAY") else 0.3
+
 
-def play_interactive():
+def play_interactive(delay=UI_DELAY):
     """Jupyter version of main() from AI_plays_TicTacToe.py"""
     board = ["_"] * 9
+    x_bits, o_bits = 0, 0
 
     print("")
     print(68 * "=")
@@ -270,43 +465,50 @@ def play_interactive():
     print("AI will play 'X', you play 'O'.\n")
 
     first = input("Do you want to play first? [Y/n] ")
-    player, opp = ("O", "X") if first.lower() != 'n' else ("X", "O")
+    # AI plays "X", so it is AI's turn whenever is_x_turn is True
+    is_x_turn = first.lower() == 'n'
     print(f"")
 
     out = widgets.Output()
 
     def ai_move():
-        nonlocal player, opp
+        nonlocal is_x_turn, x_bits, o_bits
         print("\nThis is AI's turn.\n")
-        sleep(0.3)
-        res_x = check_player_win(board, "X")
-        res_o = check_player_win(board, "O")
-
+        sleep(delay)
+        res_x = check_player_win(x_bits, o_bits, 1)
         if res_x is not None:
             move_index = res_x[0]
             board[move_index] = "X"
-            update_(buttons, board)
+            x_bits |= 1 << move_index
+            update_one(buttons, board, move_index)
             with out:
                 clear_output(wait=True)
                 print("\nAI wins!")
             disable_all(buttons)
             return True
-        elif res_o is not None:
+
+        # Only needed if AI can't win right away
+        res_o = check_player_win(o_bits, x_bits, -1)
+        if res_o is not None:
             move_index = res_o[0]
         else:
-            move_index, _ = minimax(board, "X", "O")
+            move_index, _ = BEST[x_bits, o_bits]
 
         board[move_index] = "X"
-        update_(buttons, board)
+        x_bits |= 1 << move_index
+        update_one(buttons, board, move_index)
 
-        player, opp = opp, player
+        is_x_turn = not is_x_turn
 
         # If your turn is the last turn, already decides if there will be no result
-        if len(avail_moves(board)) == 1:
-            sleep(0.2)
-            board[avail_moves(board)[0]] = player
-            update_(buttons, board)
-            res = check_player_win(board, player)
+        occ = x_bits | o_bits
+        if (occ ^ 0x1FF).bit_count() == 1:
+            sleep(min(delay, 0.2))
+            move_index = next(avail_iter(occ))
+            board[move_index] = "O"
+            o_bits |= 1 << move_index
+            update_one(buttons, board, move_index)
+            res = check_player_win(o_bits, x_bits, -1)
             if res is not None:
                 p_name = "You"
                 print(f"{p_name} win!!")
@@ -318,7 +520,7 @@ def play_interactive():
             return True
 
         # Ends game when AI takes last empty slot
-        if not avail_moves(board):
+        if occ == 0x1FF:
             with out:
                 clear_output(wait=True)
                 print("\nIt's a draw!")
@@ -328,17 +530,18 @@ def play_interactive():
         return False
 
     def handle_click(btn):
-        nonlocal player, opp
-        if player != "O" or board[btn.index] != "_":
+        nonlocal is_x_turn, o_bits
+        if is_x_turn or board[btn.index] != "_":
             return
 
         print("\nThis is your turn.\n")
         board[btn.index] = "O"
-        update_(buttons, board)
+        o_bits |= 1 << btn.index
+        update_one(buttons, board, btn.index)
 
-        player, opp = opp, player
+        is_x_turn = not is_x_turn
 
-        if not avail_moves(board):
+        if x_bits | o_bits == 0x1FF:
             with out:
                 clear_output(wait=True)
                 print("\nIt's a draw!")
@@ -352,11 +555,11 @@ def play_interactive():
     # Build interactive board
     grid, buttons = make_board_display(board, handle_click)
 
-    update_(buttons, board)
+    update_all(buttons, board)
     display(grid, out)
 
     # If AI starts
-    if player == "X":
+    if is_x_turn:
         ai_move()
 
 play_interactive()